@@ -4,95 +4,264 @@ Performs statistical analysis and trend identification using Python and Pandas
 """
 
 import sqlite3
-import pandas as pd
-import numpy as np
 from datetime import datetime
+import functools
 import json
+import math
+
+# pandas, numpy and the optional duckdb engine are imported where they are
+# used, so importing this module stays cheap on cold starts
+
+# Per student/course score aggregates shared by most analytics queries
+STUDENT_COURSE_QUERY = '''
+    SELECT 
+        s.student_id,
+        s.first_name || ' ' || s.last_name AS student_name,
+        s.email,
+        s.grade_level,
+        s.department,
+        c.course_id,
+        c.course_code,
+        c.course_name,
+        c.department AS course_department,
+        c.credits,
+        c.difficulty_level,
+        COUNT(DISTINCT a.assessment_id) AS total_assessments,
+        COUNT(g.score) AS score_count,
+        SUM(g.score) AS score_sum,
+        SUM(g.score * g.score) AS score_sq_sum,
+        AVG(g.score) AS average_score,
+        MIN(g.score) AS min_score,
+        MAX(g.score) AS max_score
+    FROM students s
+    JOIN enrollments e ON s.student_id = e.student_id
+    JOIN courses c ON e.course_id = c.course_id
+    JOIN assessments a ON c.course_id = a.course_id
+    LEFT JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
+    GROUP BY s.student_id, s.first_name, s.last_name, s.email, s.grade_level, s.department,
+        c.course_id, c.course_code, c.course_name, c.department, c.credits, c.difficulty_level
+'''
+
+# Rows fetched per batch by queries that can return wide or long results
+READ_CHUNKSIZE = 100_000
+
+# Connection settings for the read-heavy analytics workload
+ANALYTICS_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-262144',  # 256 MB page cache
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',  # 256 MB memory-mapped I/O
+]
+
+# Attendance rate next to average score for every student/course with attendance records
+ATTENDANCE_SCORE_QUERY = '''
+    SELECT 
+        sca.student_id,
+        sca.student_name,
+        sca.course_id,
+        sca.course_name,
+        att.classes_present * 100.0 / att.total_classes AS attendance_rate,
+        sca.average_score
+    FROM sca
+    JOIN (
+        SELECT 
+            student_id,
+            course_id,
+            COUNT(CASE WHEN status = 'Present' THEN 1 END) AS classes_present,
+            COUNT(attendance_id) AS total_classes
+        FROM attendance
+        GROUP BY student_id, course_id
+    ) att ON sca.student_id = att.student_id AND sca.course_id = att.course_id
+'''
+
+def trailing_mean(values, window):
+    """Mean of each value and up to window-1 preceding ones (rolling, min_periods=1)"""
+    import numpy as np
+    
+    values = np.asarray(values, dtype=float)
+    csum = np.cumsum(values)
+    totals = csum.copy()
+    totals[window:] -= csum[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return totals / counts
+
+def cached_result(method):
+    """Memoize a DataFrame-returning analytics method per arguments until refresh()"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._cache:
+            self._cache[key] = method(self, *args, **kwargs)
+        return self._cache[key].copy()
+    return wrapper
 
 class PerformanceAnalytics:
-    def __init__(self, db_name='student_performance.db'):
-        """Initialize analytics engine"""
+    def __init__(self, db_name='student_performance.db', engine='sqlite'):
+        """Initialize analytics engine ('sqlite' or 'duckdb' query engine)"""
+        if engine not in ('sqlite', 'duckdb'):
+            raise ValueError(f"Unknown engine '{engine}'")
         self.db_name = db_name
+        self.engine = engine
         self.conn = None
+        self.owns_conn = True
+        self.duck = None
+        self._sca_materialized = False
+        self._cache = {}
+        
+    def connect(self, conn=None):
+        """Establish database connection, or reuse an already open one"""
+        from database_setup import INDEXES
+        
+        self.owns_conn = conn is None
+        self.conn = sqlite3.connect(self.db_name) if conn is None else conn
+        for pragma in ANALYTICS_PRAGMAS:
+            self.conn.execute(pragma)
+        # Databases created before the indexes were part of the schema get them here
+        for index in INDEXES:
+            self.conn.execute(index)
+        self.conn.commit()
+        
+        # Run analytics queries in DuckDB's vectorized engine over the SQLite file
+        if self.engine == 'duckdb':
+            import duckdb
+            
+            self.duck = duckdb.connect()
+            self.duck.execute('INSTALL sqlite; LOAD sqlite;')
+            db_path = self.db_name.replace("'", "''")
+            self.duck.execute(f"ATTACH '{db_path}' AS analytics (TYPE SQLITE, READ_ONLY)")
+            self.duck.execute('USE analytics')
+        self.refresh()
         
-    def connect(self):
-        """Establish database connection"""
-        self.conn = sqlite3.connect(self.db_name)
+    def refresh(self):
+        """Discard cached results so the next call re-reads the database"""
+        self._cache.clear()
         
+    def _read_sql(self, query, params=(), chunksize=None):
+        """Run a read-only query on the active engine and return a DataFrame
+        
+        With chunksize, SQLite rows are fetched and converted in batches so only
+        one batch of Python row tuples is alive at a time.
+        """
+        import pandas as pd
+        
+        if self.duck is not None:
+            return self.duck.execute(query, list(params)).df()
+        if chunksize is None:
+            return pd.read_sql_query(query, self.conn, params=params)
+        chunks = pd.read_sql_query(query, self.conn, params=params, chunksize=chunksize)
+        return pd.concat(chunks, ignore_index=True)
+    
+    def _execute(self, statement):
+        """Run a statement on the active engine"""
+        if self.duck is not None:
+            self.duck.execute(statement)
+        else:
+            self.conn.execute(statement)
+    
+    def _base_cte(self):
+        """Return the WITH clause defining sca, or nothing when it is a temp table"""
+        if self._sca_materialized:
+            return ''
+        return f'WITH sca AS ({STUDENT_COURSE_QUERY})'
+    
+    def _materialize_base(self):
+        """Build the student/course aggregates once as a temp table"""
+        self._execute('DROP TABLE IF EXISTS temp.sca')
+        self._execute(f'CREATE TEMP TABLE sca AS {STUDENT_COURSE_QUERY}')
+        self._sca_materialized = True
+    
+    def _drop_base(self):
+        """Drop the materialized student/course aggregates"""
+        self._execute('DROP TABLE IF EXISTS temp.sca')
+        self._sca_materialized = False
+    
+    def _sample_std_dev(self, stats):
+        """Sample standard deviation (ddof=1) from population variance var_s and count n"""
+        import numpy as np
+        
+        n = stats['n']
+        variance = (stats['var_s'] * n / (n - 1)).clip(lower=0)
+        return np.sqrt(variance)
+    
+    def _merge_std_dev(self, df, std_query, key):
+        """Attach sample standard deviation of scores per group to df"""
+        stats = self._read_sql(std_query)
+        stats['score_std_dev'] = self._sample_std_dev(stats)
+        
+        df = df.merge(stats[[key, 'score_std_dev']], on=key, how='left')
+        df['score_std_dev'] = df['score_std_dev'].fillna(0)
+        return df
+    
+    @cached_result
     def get_student_performance_summary(self):
         """Get comprehensive performance summary for all students"""
-        query = '''
+        query = self._base_cte() + '''
             SELECT 
-                s.student_id,
-                s.first_name || ' ' || s.last_name AS student_name,
-                s.grade_level,
-                s.department,
-                c.course_name,
-                c.difficulty_level,
-                AVG(g.score) AS average_score,
-                COUNT(DISTINCT a.assessment_id) AS total_assessments,
-                MIN(g.score) AS min_score,
-                MAX(g.score) AS max_score
-            FROM students s
-            JOIN enrollments e ON s.student_id = e.student_id
-            JOIN courses c ON e.course_id = c.course_id
-            JOIN assessments a ON c.course_id = a.course_id
-            LEFT JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
-            GROUP BY s.student_id, c.course_id
-            ORDER BY s.student_id, average_score DESC
+                student_id,
+                student_name,
+                grade_level,
+                department,
+                course_name,
+                difficulty_level,
+                average_score,
+                total_assessments,
+                min_score,
+                max_score
+            FROM sca
+            ORDER BY student_id, average_score DESC
         '''
-        df = pd.read_sql_query(query, self.conn)
+        df = self._read_sql(query)
         return df
     
-    def calculate_gpa(self):
-        """Calculate GPA for each student"""
-        query = '''
+    def _gpa_query(self):
+        """SQL computing GPA and credits per student, best GPA first"""
+        # Convert each course average to the GPA scale (4.0) and weight by credits
+        return self._base_cte() + '''
             SELECT 
-                s.student_id,
-                s.first_name || ' ' || s.last_name AS student_name,
-                c.course_code,
-                c.course_name,
-                c.credits,
-                AVG(g.score) AS course_average
-            FROM students s
-            JOIN enrollments e ON s.student_id = e.student_id
-            JOIN courses c ON e.course_id = c.course_id
-            JOIN assessments a ON c.course_id = a.course_id
-            JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
-            GROUP BY s.student_id, c.course_id
+                student_id,
+                student_name,
+                SUM(credits * CASE 
+                    WHEN average_score >= 93 THEN 4.0
+                    WHEN average_score >= 90 THEN 3.7
+                    WHEN average_score >= 87 THEN 3.3
+                    WHEN average_score >= 83 THEN 3.0
+                    WHEN average_score >= 80 THEN 2.7
+                    WHEN average_score >= 77 THEN 2.3
+                    WHEN average_score >= 73 THEN 2.0
+                    WHEN average_score >= 70 THEN 1.7
+                    WHEN average_score >= 67 THEN 1.3
+                    WHEN average_score >= 60 THEN 1.0
+                    ELSE 0.0
+                END) / SUM(credits) AS GPA,
+                SUM(credits) AS credits
+            FROM sca
+            WHERE score_count > 0
+            GROUP BY student_id, student_name
+            ORDER BY GPA DESC, student_id
         '''
-        df = pd.read_sql_query(query, self.conn)
-        
-        # Convert percentage to GPA scale (4.0)
-        def score_to_gpa(score):
-            if score >= 93: return 4.0
-            elif score >= 90: return 3.7
-            elif score >= 87: return 3.3
-            elif score >= 83: return 3.0
-            elif score >= 80: return 2.7
-            elif score >= 77: return 2.3
-            elif score >= 73: return 2.0
-            elif score >= 70: return 1.7
-            elif score >= 67: return 1.3
-            elif score >= 60: return 1.0
-            else: return 0.0
-        
-        df['grade_points'] = df['course_average'].apply(score_to_gpa)
-        df['weighted_points'] = df['grade_points'] * df['credits']
-        
-        # Calculate GPA by student
-        gpa_df = df.groupby(['student_id', 'student_name']).agg({
-            'weighted_points': 'sum',
-            'credits': 'sum'
-        }).reset_index()
+    
+    @cached_result
+    def calculate_gpa(self):
+        """Calculate GPA for each student"""
+        gpa_df = self._read_sql(self._gpa_query())
+        gpa_df['GPA'] = gpa_df['GPA'].round(2)
         
-        gpa_df['GPA'] = (gpa_df['weighted_points'] / gpa_df['credits']).round(2)
-        gpa_df = gpa_df[['student_id', 'student_name', 'GPA', 'credits']].sort_values('GPA', ascending=False)
+        return gpa_df
+    
+    def _top_n_gpa(self, n):
+        """Fetch only the n students with the highest GPA"""
+        gpa_df = self._read_sql(self._gpa_query() + 'LIMIT ?', params=(n,))
+        gpa_df['GPA'] = gpa_df['GPA'].round(2)
         
         return gpa_df
     
+    @cached_result
     def identify_at_risk_students(self, threshold=70):
         """Identify students at risk based on performance threshold"""
+        import numpy as np
+        import pandas as pd
+        
         query = '''
             SELECT 
                 s.student_id,
@@ -107,52 +276,40 @@ class PerformanceAnalytics:
             JOIN courses c ON e.course_id = c.course_id
             JOIN assessments a ON c.course_id = a.course_id
             LEFT JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
-            GROUP BY s.student_id, c.course_id
+            GROUP BY s.student_id, s.first_name, s.last_name, s.email, c.course_id, c.course_name
             HAVING average_score < ?
             ORDER BY average_score ASC
         '''
-        df = pd.read_sql_query(query, self.conn, params=(threshold, threshold))
-        df['risk_level'] = df['average_score'].apply(
-            lambda x: 'Critical' if x < 60 else ('High' if x < 65 else 'Moderate')
-        )
+        df = self._read_sql(query, params=(threshold, threshold))
+        scores = df['average_score'].values
+        risk_levels = np.select([scores < 60, scores < 65], ['Critical', 'High'], default='Moderate')
+        df['risk_level'] = pd.Categorical(risk_levels, categories=['Critical', 'High', 'Moderate'])
         return df
     
+    @cached_result
     def course_difficulty_analysis(self):
         """Analyze course difficulty based on student performance"""
-        query = '''
+        query = self._base_cte() + '''
             SELECT 
-                c.course_code,
-                c.course_name,
-                c.difficulty_level,
-                c.department,
-                c.course_id,
-                COUNT(DISTINCT e.student_id) AS enrolled_students,
-                AVG(g.score) AS average_score,
-                MIN(g.score) AS min_score,
-                MAX(g.score) AS max_score
-            FROM courses c
-            JOIN enrollments e ON c.course_id = e.course_id
-            JOIN assessments a ON c.course_id = a.course_id
-            LEFT JOIN grades g ON a.assessment_id = g.assessment_id
-            GROUP BY c.course_id
+                course_code,
+                course_name,
+                difficulty_level,
+                course_department AS department,
+                COUNT(*) AS enrolled_students,
+                SUM(score_sum) / SUM(score_count) AS average_score,
+                MIN(min_score) AS min_score,
+                MAX(max_score) AS max_score,
+                SUM(score_sq_sum) / SUM(score_count)
+                    - (SUM(score_sum) / SUM(score_count)) * (SUM(score_sum) / SUM(score_count)) AS var_s,
+                SUM(score_count) AS n
+            FROM sca
+            GROUP BY course_id, course_code, course_name, difficulty_level, course_department
             ORDER BY average_score ASC
         '''
-        df = pd.read_sql_query(query, self.conn)
-        
-        # Calculate standard deviation using Pandas
-        std_devs = []
-        for course_id in df['course_id']:
-            score_query = f'''
-                SELECT g.score
-                FROM grades g
-                JOIN assessments a ON g.assessment_id = a.assessment_id
-                WHERE a.course_id = {course_id}
-            '''
-            scores = pd.read_sql_query(score_query, self.conn)
-            std_devs.append(scores['score'].std() if len(scores) > 0 else 0)
+        df = self._read_sql(query)
         
-        df['score_std_dev'] = std_devs
-        df = df.drop('course_id', axis=1)
+        df['score_std_dev'] = self._sample_std_dev(df).fillna(0)
+        df = df.drop(['var_s', 'n'], axis=1)
         
         # Calculate difficulty score (lower average + higher std dev = more difficult)
         df['difficulty_score'] = (100 - df['average_score']) + (df['score_std_dev'] * 0.5)
@@ -160,26 +317,20 @@ class PerformanceAnalytics:
         
         return df
     
+    @cached_result
     def attendance_performance_correlation(self):
         """Analyze correlation between attendance and performance"""
-        query = '''
+        query = self._base_cte() + f'''
             SELECT 
-                s.student_id,
-                s.first_name || ' ' || s.last_name AS student_name,
-                c.course_name,
-                COUNT(CASE WHEN at.status = 'Present' THEN 1 END) * 100.0 / 
-                    NULLIF(COUNT(at.attendance_id), 0) AS attendance_rate,
-                AVG(g.score) AS average_score
-            FROM students s
-            JOIN enrollments e ON s.student_id = e.student_id
-            JOIN courses c ON e.course_id = c.course_id
-            LEFT JOIN attendance at ON s.student_id = at.student_id AND c.course_id = at.course_id
-            LEFT JOIN assessments a ON c.course_id = a.course_id
-            LEFT JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
-            GROUP BY s.student_id, c.course_id
-            HAVING COUNT(at.attendance_id) > 0
+                student_id,
+                student_name,
+                course_name,
+                attendance_rate,
+                average_score
+            FROM ({ATTENDANCE_SCORE_QUERY}) pairs
+            ORDER BY student_id, course_id
         '''
-        df = pd.read_sql_query(query, self.conn)
+        df = self._read_sql(query, chunksize=READ_CHUNKSIZE)
         
         # Calculate correlation
         if len(df) > 0:
@@ -188,40 +339,57 @@ class PerformanceAnalytics:
         
         return df
     
+    def attendance_score_correlation(self):
+        """Pearson correlation between attendance rate and average score, or None without data"""
+        # Aggregate the sums in SQL so only one row comes back to Python
+        query = self._base_cte() + f'''
+            SELECT 
+                COUNT(*) AS n,
+                SUM(attendance_rate) AS sum_x,
+                SUM(average_score) AS sum_y,
+                SUM(attendance_rate * attendance_rate) AS sum_xx,
+                SUM(average_score * average_score) AS sum_yy,
+                SUM(attendance_rate * average_score) AS sum_xy
+            FROM ({ATTENDANCE_SCORE_QUERY}) pairs
+            WHERE average_score IS NOT NULL
+        '''
+        sums = self._read_sql(query).iloc[0]
+        n = sums['n']
+        if n == 0:
+            return None
+        
+        covariance = n * sums['sum_xy'] - sums['sum_x'] * sums['sum_y']
+        var_x = n * sums['sum_xx'] - sums['sum_x'] ** 2
+        var_y = n * sums['sum_yy'] - sums['sum_y'] ** 2
+        if n < 2 or var_x <= 0 or var_y <= 0:
+            return float('nan')
+        return float(covariance / math.sqrt(var_x * var_y))
+    
+    @cached_result
     def department_performance_comparison(self):
         """Compare performance across departments"""
-        query = '''
+        query = self._base_cte() + '''
             SELECT 
-                s.department,
-                COUNT(DISTINCT s.student_id) AS total_students,
-                AVG(g.score) AS average_score,
-                MIN(g.score) AS min_score,
-                MAX(g.score) AS max_score
-            FROM students s
-            JOIN enrollments e ON s.student_id = e.student_id
-            JOIN assessments a ON e.course_id = a.course_id
-            LEFT JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
-            GROUP BY s.department
+                department,
+                COUNT(DISTINCT student_id) AS total_students,
+                SUM(score_sum) / SUM(score_count) AS average_score,
+                MIN(min_score) AS min_score,
+                MAX(max_score) AS max_score,
+                SUM(score_sq_sum) / SUM(score_count)
+                    - (SUM(score_sum) / SUM(score_count)) * (SUM(score_sum) / SUM(score_count)) AS var_s,
+                SUM(score_count) AS n
+            FROM sca
+            GROUP BY department
             ORDER BY average_score DESC
         '''
-        df = pd.read_sql_query(query, self.conn)
-        
-        # Calculate standard deviation using Pandas
-        std_devs = []
-        for dept in df['department']:
-            score_query = f'''
-                SELECT g.score
-                FROM grades g
-                JOIN students s ON g.student_id = s.student_id
-                WHERE s.department = "{dept}"
-            '''
-            scores = pd.read_sql_query(score_query, self.conn)
-            std_devs.append(scores['score'].std() if len(scores) > 0 else 0)
+        df = self._read_sql(query)
         
-        df['score_std_dev'] = std_devs
+        df['score_std_dev'] = self._sample_std_dev(df).fillna(0)
+        df = df.drop(['var_s', 'n'], axis=1)
         
         return df
     
+    @cached_result
     def assessment_type_analysis(self):
         """Analyze performance by assessment type"""
         query = '''
@@ -237,26 +405,28 @@ class PerformanceAnalytics:
             GROUP BY a.assessment_type
             ORDER BY average_score DESC
         '''
-        df = pd.read_sql_query(query, self.conn)
+        df = self._read_sql(query)
         
-        # Calculate standard deviation using Pandas
-        std_devs = []
-        for assess_type in df['assessment_type']:
-            score_query = f'''
-                SELECT g.score
-                FROM grades g
-                JOIN assessments a ON g.assessment_id = a.assessment_id
-                WHERE a.assessment_type = "{assess_type}"
-            '''
-            scores = pd.read_sql_query(score_query, self.conn)
-            std_devs.append(scores['score'].std() if len(scores) > 0 else 0)
-        
-        df['score_std_dev'] = std_devs
+        # Calculate standard deviation for every assessment type in a single query
+        std_query = '''
+            SELECT 
+                a.assessment_type,
+                AVG(g.score) AS avg_s,
+                AVG(g.score * g.score) - AVG(g.score) * AVG(g.score) AS var_s,
+                COUNT(g.score) AS n
+            FROM grades g
+            JOIN assessments a ON g.assessment_id = a.assessment_id
+            GROUP BY a.assessment_type
+        '''
+        df = self._merge_std_dev(df, std_query, 'assessment_type')
         
         return df
     
+    @cached_result
     def trend_analysis_over_time(self):
         """Identify performance trends over time"""
+        import pandas as pd
+        
         query = '''
             SELECT 
                 DATE(g.submission_date) AS submission_date,
@@ -267,19 +437,19 @@ class PerformanceAnalytics:
             GROUP BY DATE(g.submission_date)
             ORDER BY submission_date
         '''
-        df = pd.read_sql_query(query, self.conn)
+        df = self._read_sql(query, chunksize=READ_CHUNKSIZE)
         df['submission_date'] = pd.to_datetime(df['submission_date'])
         
         # Calculate moving average
         if len(df) > 7:
-            df['7_day_avg'] = df['average_score'].rolling(window=7, min_periods=1).mean()
+            df['7_day_avg'] = trailing_mean(df['average_score'].values, 7)
         
         return df
     
+    @cached_result
     def top_performers(self, limit=10):
         """Get top performing students"""
-        gpa_df = self.calculate_gpa()
-        return gpa_df.head(limit)
+        return self._top_n_gpa(limit)
     
     def generate_analytics_report(self):
         """Generate comprehensive analytics report"""
@@ -289,6 +459,20 @@ class PerformanceAnalytics:
             'insights': []
         }
         
+        # Run every section in one read transaction over a single join of
+        # students/courses/assessments/grades
+        self._execute('BEGIN')
+        try:
+            self._materialize_base()
+            self._add_report_sections(report)
+        finally:
+            self._drop_base()
+            self._execute('COMMIT')
+        
+        return report
+    
+    def _add_report_sections(self, report):
+        """Fill report summary and insights from the analytics methods"""
         # Overall statistics
         gpa_df = self.calculate_gpa()
         report['summary']['average_gpa'] = round(gpa_df['GPA'].mean(), 2)
@@ -318,27 +502,27 @@ class PerformanceAnalytics:
         })
         
         # Attendance correlation
-        attendance_corr = self.attendance_performance_correlation()
-        if len(attendance_corr) > 0 and 'correlation' in attendance_corr.columns:
-            corr_value = attendance_corr['correlation'].iloc[0] if len(attendance_corr) > 0 else 0
+        corr_value = self.attendance_score_correlation()
+        if corr_value is not None:
             report['insights'].append({
                 'type': 'attendance_correlation',
                 'correlation': round(corr_value, 3),
                 'interpretation': 'Strong positive' if corr_value > 0.7 else ('Moderate' if corr_value > 0.4 else 'Weak')
             })
-        
-        return report
     
     def close(self):
         """Close database connection"""
-        if self.conn:
+        if self.duck is not None:
+            self.duck.close()
+            self.duck = None
+        # A borrowed connection stays open for its owner
+        if self.conn and self.owns_conn:
             self.conn.close()
+        self.conn = None
+        self.refresh()
 
-if __name__ == "__main__":
-    # Run analytics
-    analytics = PerformanceAnalytics()
-    analytics.connect()
-    
+def print_report(analytics):
+    """Print the full analytics report from a connected PerformanceAnalytics"""
     print("="*70)
     print("STUDENT PERFORMANCE ANALYTICS REPORT")
     print("="*70)
@@ -382,7 +566,13 @@ if __name__ == "__main__":
     report = analytics.generate_analytics_report()
     print(json.dumps(report, indent=2))
     
-    analytics.close()
     print("\n" + "="*70)
     print("Analytics completed successfully!")
     print("="*70)
+
+if __name__ == "__main__":
+    # Run analytics
+    analytics = PerformanceAnalytics()
+    analytics.connect()
+    print_report(analytics)
+    analytics.close()
@@ -3,7 +3,10 @@ Google Cloud Platform Deployment Configuration
 Demonstrates cloud fundamentals and scalable data processing
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import json
+from pathlib import Path
 
 # GCP Project Configuration
 GCP_CONFIG = {
@@ -146,6 +149,9 @@ MONITORING_CONFIG = {
 }
 
 
+# The generate_* functions render from the static configs above, so each
+# rendering is cached for the life of the process
+@functools.lru_cache(maxsize=1)
 def generate_terraform_config():
     """Generate Terraform configuration for GCP infrastructure"""
     terraform_config = f'''
@@ -251,6 +257,7 @@ resource "google_cloud_scheduler_job" "daily_report" {{
     return terraform_config
 
 
+@functools.lru_cache(maxsize=1)
 def generate_app_yaml():
     """Generate App Engine app.yaml configuration"""
     app_yaml = f'''
@@ -275,6 +282,7 @@ handlers:
     return app_yaml
 
 
+@functools.lru_cache(maxsize=1)
 def generate_requirements_txt():
     """Generate requirements.txt for cloud deployment"""
     requirements = '''
@@ -306,22 +314,9 @@ python-dotenv==1.0.0
     return requirements
 
 
-def save_cloud_configs():
-    """Save all cloud configuration files"""
-    
-    # Save Terraform configuration
-    with open('main.tf', 'w') as f:
-        f.write(generate_terraform_config())
-    
-    # Save App Engine configuration
-    with open('app.yaml', 'w') as f:
-        f.write(generate_app_yaml())
-    
-    # Save requirements.txt
-    with open('requirements.txt', 'w') as f:
-        f.write(generate_requirements_txt())
-    
-    # Save full configuration as JSON
+@functools.lru_cache(maxsize=1)
+def generate_gcp_config_json():
+    """Generate the full GCP configuration as JSON"""
     full_config = {
         "gcp": GCP_CONFIG,
         "cloud_sql": CLOUD_SQL_CONFIG,
@@ -332,9 +327,24 @@ def save_cloud_configs():
         "cloud_scheduler": CLOUD_SCHEDULER_CONFIG,
         "monitoring": MONITORING_CONFIG
     }
+    return json.dumps(full_config, indent=2)
+
+
+def save_cloud_configs():
+    """Save all cloud configuration files"""
+    
+    # Render everything up front: Terraform, App Engine, requirements.txt
+    # and the full configuration as JSON
+    files = {
+        'main.tf': generate_terraform_config(),
+        'app.yaml': generate_app_yaml(),
+        'requirements.txt': generate_requirements_txt(),
+        'gcp_config.json': generate_gcp_config_json()
+    }
     
-    with open('gcp_config.json', 'w') as f:
-        json.dump(full_config, f, indent=2)
+    # Write the files concurrently so their open/write/close calls overlap
+    with ThreadPoolExecutor(max_workers=len(files)) as executor:
+        list(executor.map(lambda item: Path(item[0]).write_text(item[1]), files.items()))
     
     print("✓ Cloud configuration files generated successfully!")
     print("  - main.tf (Terraform)")
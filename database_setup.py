@@ -4,10 +4,69 @@ Database Setup and Schema Creation
 """
 
 import sqlite3
-import random
-from datetime import datetime, timedelta
+import math
+from collections import defaultdict
+from datetime import datetime
+import numpy as np
 import pandas as pd
 
+# Connection settings applied after every sqlite3.connect
+SQLITE_PRAGMAS = [
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-64000',  # 64 MB page cache
+    'PRAGMA mmap_size=268435456',  # 256 MB memory-mapped I/O
+]
+
+# Write-side settings for the setup connection only: cap the WAL file left
+# after checkpoints and checkpoint every 1000 pages
+SETUP_PRAGMAS = [
+    'PRAGMA journal_size_limit=67108864',  # 64 MB
+    'PRAGMA wal_autocheckpoint=1000',
+]
+
+# Larger pages give shallower B-trees for the scan-heavy analytics queries
+PAGE_SIZE = 8192
+
+# Covering indexes for the joins and date filters used by the analytics queries
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_grades_student_assessment_score ON grades(student_id, assessment_id, score)',
+    'CREATE INDEX IF NOT EXISTS idx_grades_assessment ON grades(assessment_id)',
+    'CREATE INDEX IF NOT EXISTS idx_grades_submission_date ON grades(submission_date)',
+    'CREATE INDEX IF NOT EXISTS idx_enrollments_student_course ON enrollments(student_id, course_id)',
+    'CREATE INDEX IF NOT EXISTS idx_assessments_course_assessment ON assessments(course_id, assessment_id)',
+    'CREATE INDEX IF NOT EXISTS idx_attendance_student_course_status ON attendance(student_id, course_id, status)',
+    'CREATE INDEX IF NOT EXISTS idx_students_department ON students(department)',
+]
+
+# Bound parameters per statement (SQLITE_MAX_VARIABLE_NUMBER on older builds)
+MAX_SQL_VARIABLES = 999
+
+def days_ago(offsets):
+    """Format the dates offsets days before today as YYYY-MM-DD strings"""
+    offsets = np.asarray(offsets)
+    if offsets.size == 0:
+        return []
+    
+    # Format each day in range once, then look every offset up in that table
+    today = np.datetime64(datetime.now().date(), 'D')
+    date_table = (today - np.arange(offsets.max() + 1)).astype(str).astype(object)
+    return date_table[offsets].tolist()
+
+def configure_connection(conn, db_name):
+    """Switch a connection to WAL journaling and apply SQLITE_PRAGMAS"""
+    # In-memory databases cannot use a write-ahead log
+    if db_name != ':memory:':
+        conn.execute('PRAGMA journal_mode=WAL')
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    # Older SQLite builds ship without the math functions
+    try:
+        conn.execute('SELECT sqrt(1)')
+    except sqlite3.OperationalError:
+        conn.create_function('sqrt', 1, lambda x: None if x is None else math.sqrt(x), deterministic=True)
+    return conn
+
 class DatabaseSetup:
     def __init__(self, db_name='student_performance.db'):
         """Initialize database connection"""
@@ -17,13 +76,33 @@ class DatabaseSetup:
         
     def connect(self):
         """Establish database connection"""
-        self.conn = sqlite3.connect(self.db_name)
+        # Autocommit mode: transactions are opened explicitly where needed.
+        # A larger statement cache keeps the batched INSERTs prepared.
+        self.conn = sqlite3.connect(self.db_name, isolation_level=None, cached_statements=256)
+        configure_connection(self.conn, self.db_name)
+        for pragma in SETUP_PRAGMAS:
+            self.conn.execute(pragma)
         self.cursor = self.conn.cursor()
         print(f"✓ Connected to database: {self.db_name}")
         
     def create_tables(self):
         """Create database schema for student performance tracking"""
         
+        # The page size only changes on VACUUM, and never while in WAL mode
+        if self.cursor.execute('PRAGMA page_size').fetchone()[0] != PAGE_SIZE:
+            in_wal = self.cursor.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+            try:
+                if in_wal:
+                    self.cursor.execute('PRAGMA journal_mode=DELETE')
+                self.cursor.execute(f'PRAGMA page_size={PAGE_SIZE}')
+                self.cursor.execute('VACUUM')
+            except sqlite3.OperationalError as e:
+                # Another connection holds the database; keep the current page size
+                print(f"✗ Could not change page size: {e}")
+            finally:
+                if in_wal:
+                    self.cursor.execute('PRAGMA journal_mode=WAL')
+        
         # Students table
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS students (
@@ -103,11 +182,33 @@ class DatabaseSetup:
             )
         ''')
         
+        # Indexes
+        for index in INDEXES:
+            self.cursor.execute(index)
+        
         self.conn.commit()
         print("✓ Database schema created successfully")
         
-    def populate_sample_data(self):
-        """Populate database with realistic sample data"""
+    def _insert_rows(self, table, columns, rows):
+        """Insert rows using multi-row INSERT statements"""
+        rows_per_statement = max(1, MAX_SQL_VARIABLES // len(columns))
+        row_placeholder = '(' + ', '.join('?' * len(columns)) + ')'
+        for start in range(0, len(rows), rows_per_statement):
+            batch = rows[start:start + rows_per_statement]
+            values = ', '.join([row_placeholder] * len(batch))
+            self.cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values}",
+                [value for row in batch for value in row]
+            )
+        
+    def populate_sample_data(self, seed=None):
+        """Populate database with realistic sample data (reproducible when seed is given)"""
+        
+        # Insert all sample data in a single transaction
+        self.cursor.execute('BEGIN IMMEDIATE')
+        
+        # Random values are drawn a whole column at a time
+        rng = np.random.default_rng(seed)
         
         # Sample data
         departments = ['Computer Science', 'Mathematics', 'Physics', 'Engineering', 'Business']
@@ -117,20 +218,20 @@ class DatabaseSetup:
                      'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson']
         
         # Insert students
-        students_data = []
-        for i in range(50):
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
-            email = f"{first_name.lower()}.{last_name.lower()}{i}@university.edu"
-            enrollment_date = (datetime.now() - timedelta(days=random.randint(365, 1460))).strftime('%Y-%m-%d')
-            grade_level = random.randint(1, 4)
-            department = random.choice(departments)
-            students_data.append((first_name, last_name, email, enrollment_date, grade_level, department))
-        
-        self.cursor.executemany('''
-            INSERT INTO students (first_name, last_name, email, enrollment_date, grade_level, department)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', students_data)
+        num_students = 50
+        student_first = rng.choice(first_names, num_students).tolist()
+        student_last = rng.choice(last_names, num_students).tolist()
+        emails = [f"{first.lower()}.{last.lower()}{i}@university.edu"
+                  for i, (first, last) in enumerate(zip(student_first, student_last))]
+        enrollment_dates = days_ago(rng.integers(365, 1461, num_students))
+        grade_levels = rng.integers(1, 5, num_students).tolist()
+        student_departments = rng.choice(departments, num_students).tolist()
+        students_data = list(zip(student_first, student_last, emails, enrollment_dates,
+                                 grade_levels, student_departments))
+        
+        self._insert_rows('students',
+                          ['first_name', 'last_name', 'email', 'enrollment_date', 'grade_level', 'department'],
+                          students_data)
         
         # Insert courses
         courses_data = [
@@ -146,86 +247,94 @@ class DatabaseSetup:
             ('CS302', 'Machine Learning', 'Computer Science', 4, 'Advanced')
         ]
         
-        self.cursor.executemany('''
-            INSERT INTO courses (course_code, course_name, department, credits, difficulty_level)
-            VALUES (?, ?, ?, ?, ?)
-        ''', courses_data)
+        self._insert_rows('courses',
+                          ['course_code', 'course_name', 'department', 'credits', 'difficulty_level'],
+                          courses_data)
         
         # Insert enrollments
-        enrollments_data = []
         semesters = ['Fall 2023', 'Spring 2024', 'Fall 2024']
-        for student_id in range(1, 51):
-            num_courses = random.randint(3, 5)
-            enrolled_courses = random.sample(range(1, 11), num_courses)
-            for course_id in enrolled_courses:
-                enrollment_date = (datetime.now() - timedelta(days=random.randint(30, 180))).strftime('%Y-%m-%d')
-                semester = random.choice(semesters)
-                enrollments_data.append((student_id, course_id, enrollment_date, semester))
-        
-        self.cursor.executemany('''
-            INSERT INTO enrollments (student_id, course_id, enrollment_date, semester)
-            VALUES (?, ?, ?, ?)
-        ''', enrollments_data)
+        num_courses = len(courses_data)
+        courses_per_student = rng.integers(3, 6, num_students)
+        max_courses = courses_per_student.max()
+        
+        # Each student takes the courses with the smallest random keys: ordering the
+        # first max_courses columns gives every row a sample without replacement
+        course_keys = rng.random((num_students, num_courses))
+        picks = np.argpartition(course_keys, np.arange(max_courses), axis=1)[:, :max_courses]
+        taken = np.arange(max_courses) < courses_per_student[:, None]
+        enrollment_students = np.repeat(np.arange(1, num_students + 1), courses_per_student)
+        enrollment_courses = picks[taken] + 1
+        
+        num_enrollments = len(enrollment_students)
+        enrollment_dates = days_ago(rng.integers(30, 181, num_enrollments))
+        enrollment_semesters = rng.choice(semesters, num_enrollments).tolist()
+        enrollments_data = list(zip(enrollment_students.tolist(), enrollment_courses.tolist(),
+                                    enrollment_dates, enrollment_semesters))
+        
+        self._insert_rows('enrollments',
+                          ['student_id', 'course_id', 'enrollment_date', 'semester'],
+                          enrollments_data)
         
         # Insert assessments
         assessment_types = ['Quiz', 'Midterm', 'Final', 'Project', 'Assignment']
         assessments_data = []
+        assessment_dates = iter(days_ago(rng.integers(1, 91, 10 * len(assessment_types))))
         for course_id in range(1, 11):
             for i, assess_type in enumerate(assessment_types):
-                assessment_date = (datetime.now() - timedelta(days=random.randint(1, 90))).strftime('%Y-%m-%d')
+                assessment_date = next(assessment_dates)
                 max_score = 100.0
                 weight = 0.1 if assess_type == 'Quiz' else (0.25 if assess_type in ['Midterm', 'Final'] else 0.15)
                 assessments_data.append((course_id, assess_type, f"{assess_type} {i+1}", max_score, weight, assessment_date))
         
-        self.cursor.executemany('''
-            INSERT INTO assessments (course_id, assessment_type, assessment_name, max_score, weight, assessment_date)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', assessments_data)
-        
-        # Insert grades
-        grades_data = []
-        for enrollment_id in range(1, len(enrollments_data) + 1):
-            # Get student_id and course_id from enrollments
-            self.cursor.execute('SELECT student_id, course_id FROM enrollments WHERE enrollment_id = ?', (enrollment_id,))
-            student_id, course_id = self.cursor.fetchone()
-            
-            # Get assessments for this course
-            self.cursor.execute('SELECT assessment_id FROM assessments WHERE course_id = ?', (course_id,))
-            assessment_ids = [row[0] for row in self.cursor.fetchall()]
-            
-            for assessment_id in assessment_ids:
-                # Generate realistic scores (normal distribution)
-                score = max(0, min(100, random.gauss(75, 15)))
-                submission_date = (datetime.now() - timedelta(days=random.randint(1, 60))).strftime('%Y-%m-%d')
-                feedback = random.choice(['Good work!', 'Needs improvement', 'Excellent!', 'Well done', None])
-                grades_data.append((student_id, assessment_id, round(score, 2), submission_date, feedback))
-        
-        self.cursor.executemany('''
-            INSERT INTO grades (student_id, assessment_id, score, submission_date, feedback)
-            VALUES (?, ?, ?, ?, ?)
-        ''', grades_data)
+        self._insert_rows('assessments',
+                          ['course_id', 'assessment_type', 'assessment_name', 'max_score', 'weight', 'assessment_date'],
+                          assessments_data)
+        
+        # Map each course to its assessment ids with a single query
+        course_assessments = defaultdict(list)
+        self.cursor.execute('SELECT assessment_id, course_id FROM assessments ORDER BY assessment_id')
+        for assessment_id, course_id in self.cursor.fetchall():
+            course_assessments[course_id].append(assessment_id)
+        
+        # Insert grades: one row per enrollment x course assessment, built as columns
+        assessment_counts = [len(course_assessments[course_id]) for course_id in enrollment_courses]
+        grade_students = np.repeat(enrollment_students, assessment_counts).tolist()
+        grade_assessments = np.concatenate([course_assessments[course_id] for course_id in enrollment_courses]).tolist()
+        
+        # Generate realistic scores (normal distribution)
+        num_grades = len(grade_students)
+        feedback_options = np.array(['Good work!', 'Needs improvement', 'Excellent!', 'Well done', None], dtype=object)
+        scores = np.clip(rng.normal(75, 15, num_grades), 0, 100).round(2).tolist()
+        submission_dates = days_ago(rng.integers(1, 61, num_grades))
+        feedback = feedback_options[rng.integers(0, len(feedback_options), num_grades)].tolist()
+        grades_data = list(zip(grade_students, grade_assessments, scores, submission_dates, feedback))
+        
+        self._insert_rows('grades',
+                          ['student_id', 'assessment_id', 'score', 'submission_date', 'feedback'],
+                          grades_data)
         
         # Insert attendance records
-        attendance_data = []
         statuses = ['Present', 'Absent', 'Late', 'Excused']
         weights = [0.85, 0.05, 0.05, 0.05]  # Most students are present
+        class_days = days_ago(np.arange(30))
         
-        for enrollment_id in range(1, min(100, len(enrollments_data) + 1)):
-            self.cursor.execute('SELECT student_id, course_id FROM enrollments WHERE enrollment_id = ?', (enrollment_id,))
-            result = self.cursor.fetchone()
-            if result:
-                student_id, course_id = result
-                for day in range(30):
-                    attendance_date = (datetime.now() - timedelta(days=day)).strftime('%Y-%m-%d')
-                    status = random.choices(statuses, weights=weights)[0]
-                    attendance_data.append((student_id, course_id, attendance_date, status))
-        
-        self.cursor.executemany('''
-            INSERT INTO attendance (student_id, course_id, attendance_date, status)
-            VALUES (?, ?, ?, ?)
-        ''', attendance_data)
+        # Attendance is recorded for the first 99 enrollments on every class day
+        num_attended = min(num_enrollments, 99)
+        num_records = num_attended * len(class_days)
+        attendance_students = np.repeat(enrollment_students[:num_attended], len(class_days)).tolist()
+        attendance_courses = np.repeat(enrollment_courses[:num_attended], len(class_days)).tolist()
+        attendance_dates = class_days * num_attended
+        attendance_statuses = rng.choice(statuses, num_records, p=weights).tolist()
+        attendance_data = list(zip(attendance_students, attendance_courses, attendance_dates, attendance_statuses))
         
-        self.conn.commit()
+        self._insert_rows('attendance',
+                          ['student_id', 'course_id', 'attendance_date', 'status'],
+                          attendance_data)
+        
+        self.cursor.execute('COMMIT')
+        
+        # Collect table statistics so the query planner uses the indexes
+        self.cursor.execute('ANALYZE')
         print("✓ Sample data populated successfully")
         print(f"  - Students: 50")
         print(f"  - Courses: 10")
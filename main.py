@@ -4,8 +4,34 @@ Cloud-Based Student Performance Analytics System
 """
 
 import sys
-import os
 from datetime import datetime
+from pathlib import Path
+
+# Paths resolve next to this file, whatever the working directory
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = BASE_DIR / 'student_performance.db'
+
+# One connection shared by every menu action, so pragmas are applied once
+# and SQLite's page cache stays warm between reports
+_CONN = None
+
+def get_conn():
+    """Return the shared database connection, opening it on first use"""
+    global _CONN
+    if _CONN is None:
+        import sqlite3
+        from database_setup import configure_connection
+        
+        _CONN = sqlite3.connect(DB_PATH)
+        configure_connection(_CONN, str(DB_PATH))
+    return _CONN
+
+def close_conn():
+    """Close the shared database connection if it is open"""
+    global _CONN
+    if _CONN is not None:
+        _CONN.close()
+        _CONN = None
 
 def print_header():
     """Print application header"""
@@ -34,7 +60,9 @@ def setup_database():
     print("\n🔧 Setting up database...")
     from database_setup import DatabaseSetup
     
-    db = DatabaseSetup()
+    # Setup may rebuild the file (VACUUM), which needs it free of other connections
+    close_conn()
+    db = DatabaseSetup(db_name=str(DB_PATH))
     db.connect()
     db.create_tables()
     db.populate_sample_data()
@@ -45,29 +73,38 @@ def setup_database():
 def run_analytics():
     """Run comprehensive analytics reports"""
     print("\n📈 Running analytics reports...")
-    import subprocess
-    result = subprocess.run([sys.executable, 'analytics_engine.py'], 
-                          capture_output=False, text=True)
+    from analytics_engine import PerformanceAnalytics, print_report
     
-    if result.returncode == 0:
-        print("\n✓ Analytics reports generated successfully!")
+    analytics = PerformanceAnalytics(db_name=str(DB_PATH))
+    analytics.connect(get_conn())
+    try:
+        print_report(analytics)
+    finally:
+        analytics.close()
+    
+    print("\n✓ Analytics reports generated successfully!")
 
 def execute_queries():
     """Execute SQL query examples"""
     print("\n💾 Executing SQL queries...")
-    import subprocess
-    result = subprocess.run([sys.executable, 'sql_queries.py'], 
-                          capture_output=False, text=True)
+    import sql_queries
     
-    if result.returncode == 0:
-        print("\n✓ SQL queries executed successfully!")
+    # Prefer DuckDB's vectorized engine; SQLite runs the same queries without it
+    try:
+        results = sql_queries.run_all_duckdb(DB_PATH)
+    except Exception as e:
+        print(f"DuckDB unavailable ({e}), running queries on SQLite")
+        sql_queries.run_all(get_conn())
+    else:
+        sql_queries.print_results(results)
+    print("\n✓ SQL queries executed successfully!")
 
 def generate_cloud_config():
     """Generate cloud deployment configurations"""
     print("\n☁️  Generating cloud deployment configurations...")
     import subprocess
-    result = subprocess.run([sys.executable, 'cloud_config.py'], 
-                          capture_output=False, text=True)
+    result = subprocess.run([sys.executable, str(BASE_DIR / 'cloud_config.py')], 
+                          capture_output=False, text=True, cwd=BASE_DIR)
     
     if result.returncode == 0:
         print("\n✓ Cloud configurations generated successfully!")
@@ -76,28 +113,45 @@ def export_data():
     """Export data to CSV files"""
     print("\n📤 Exporting data to CSV...")
     
-    import sqlite3
+    import shutil
+    import subprocess
     import pandas as pd
     
-    conn = sqlite3.connect('student_performance.db')
+    conn = get_conn()
+    
+    # The sqlite3 shell writes CSV straight from C; pandas is the fallback
+    sqlite_cli = shutil.which('sqlite3')
     
     # Export tables
     tables = ['students', 'courses', 'enrollments', 'assessments', 'grades', 'attendance']
-    export_dir = 'exports'
-    
-    if not os.path.exists(export_dir):
-        os.makedirs(export_dir)
+    export_dir = BASE_DIR / 'exports'
+    export_dir.mkdir(exist_ok=True)
     
     for table in tables:
         try:
-            df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
-            filepath = f"{export_dir}/{table}.csv"
-            df.to_csv(filepath, index=False)
-            print(f"✓ Exported {table}: {len(df)} records -> {filepath}")
+            filepath = export_dir / f"{table}.csv"
+            exported = False
+            if sqlite_cli:
+                try:
+                    with open(filepath, 'w', newline='') as f:
+                        subprocess.run([sqlite_cli, '-csv', '-header', str(DB_PATH),
+                                        f"SELECT * FROM {table}"], stdout=f, check=True)
+                    records = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    exported = True
+                except (OSError, subprocess.CalledProcessError):
+                    pass
+            
+            if not exported:
+                records = 0
+                # Stream the table in chunks so only one chunk is held in memory
+                chunks = pd.read_sql_query(f"SELECT * FROM {table}", conn, chunksize=50000)
+                for i, chunk in enumerate(chunks):
+                    chunk.to_csv(filepath, index=False, mode='w' if i == 0 else 'a', header=(i == 0))
+                    records += len(chunk)
+            print(f"✓ Exported {table}: {records} records -> {filepath}")
         except Exception as e:
             print(f"✗ Error exporting {table}: {str(e)}")
     
-    conn.close()
     print("\n✓ Data export completed!")
 
 def show_system_info():
@@ -105,11 +159,10 @@ def show_system_info():
     print("\nℹ️  SYSTEM INFORMATION")
     print("-" * 80)
     
-    import sqlite3
     import pandas as pd
     
     try:
-        conn = sqlite3.connect('student_performance.db')
+        conn = get_conn()
         cursor = conn.cursor()
         
         # Get table counts
@@ -124,10 +177,11 @@ def show_system_info():
         
         print("\n📊 Database Statistics:")
         print("-" * 80)
+        # All six counts in one statement
+        cursor.execute(" UNION ALL ".join(f"SELECT '{table}', COUNT(*) FROM {table}" for _, table in tables_info))
+        counts = dict(cursor.fetchall())
         for name, table in tables_info:
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            count = cursor.fetchone()[0]
-            print(f"{name:.<25} {count:>10,} records")
+            print(f"{name:.<25} {counts[table]:>10,} records")
         
         # System features
         print("\n🎯 System Features:")
@@ -164,8 +218,6 @@ def show_system_info():
         for tech in technologies:
             print(f"  • {tech}")
         
-        conn.close()
-        
     except Exception as e:
         print(f"Error retrieving system information: {str(e)}")
         print("Note: Database may not be initialized. Run option 1 first.")
@@ -174,9 +226,6 @@ def show_system_info():
 
 def main():
     """Main application loop"""
-    os.chdir(r'C:\Users\moham\student_performance_analytics')
-
-    
     print_header()
     
     while True:
@@ -200,6 +249,7 @@ def main():
             elif choice == '7':
                 print("\n👋 Thank you for using Student Performance Analytics System!")
                 print("Goodbye!\n")
+                close_conn()
                 break
             else:
                 print("\n❌ Invalid choice. Please enter a number between 1 and 7.")
@@ -208,6 +258,7 @@ def main():
             
         except KeyboardInterrupt:
             print("\n\n👋 Application terminated by user. Goodbye!\n")
+            close_conn()
             break
         except Exception as e:
             print(f"\n❌ Error: {str(e)}")
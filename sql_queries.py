@@ -18,48 +18,65 @@ QUERIES = {
             AVG(g.score) AS overall_average,
             MIN(g.score) AS lowest_score,
             MAX(g.score) AS highest_score,
-            ROUND(STDEV(g.score), 2) AS score_variability
+            ROUND(SQRT(ABS(AVG(g.score * g.score) - AVG(g.score) * AVG(g.score))), 2) AS score_variability
         FROM students s
         LEFT JOIN enrollments e ON s.student_id = e.student_id
-        LEFT JOIN assessments a ON e.course_id = a.course_id
-        LEFT JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
-        GROUP BY s.student_id
+        LEFT JOIN sc_scores g ON s.student_id = g.student_id AND e.course_id = g.course_id
+        GROUP BY s.student_id, s.first_name, s.last_name, s.department, s.grade_level
         ORDER BY overall_average DESC;
     """,
     
     # 2. Course Performance by Difficulty Level
     "course_difficulty_performance": """
+        WITH StudentCourseScores AS (
+            SELECT 
+                g.student_id,
+                g.course_id,
+                COUNT(g.score) AS score_count,
+                SUM(g.score) AS score_sum,
+                MIN(g.score) AS min_score,
+                MAX(g.score) AS max_score
+            FROM sc_scores g
+            GROUP BY g.student_id, g.course_id
+        )
         SELECT 
             c.difficulty_level,
             COUNT(DISTINCT c.course_id) AS total_courses,
             COUNT(DISTINCT e.student_id) AS total_enrollments,
-            ROUND(AVG(g.score), 2) AS average_score,
-            ROUND(MIN(g.score), 2) AS min_score,
-            ROUND(MAX(g.score), 2) AS max_score
+            ROUND(SUM(scs.score_sum) / SUM(scs.score_count), 2) AS average_score,
+            ROUND(MIN(scs.min_score), 2) AS min_score,
+            ROUND(MAX(scs.max_score), 2) AS max_score
         FROM courses c
         JOIN enrollments e ON c.course_id = e.course_id
-        JOIN assessments a ON c.course_id = a.course_id
-        LEFT JOIN grades g ON a.assessment_id = g.assessment_id AND e.student_id = g.student_id
+        LEFT JOIN StudentCourseScores scs ON e.student_id = scs.student_id AND c.course_id = scs.course_id
+        WHERE EXISTS (SELECT 1 FROM assessments a WHERE a.course_id = c.course_id)
         GROUP BY c.difficulty_level
         ORDER BY average_score DESC;
     """,
     
     # 3. Identify High-Performing Students per Course
     "top_students_per_course": """
-        WITH CourseAverages AS (
+        WITH StudentCourseAvg AS (
+            SELECT 
+                g.student_id,
+                g.course_id,
+                AVG(g.score) AS avg_score
+            FROM sc_scores g
+            GROUP BY g.student_id, g.course_id
+        ),
+        CourseAverages AS (
             SELECT 
                 c.course_code,
                 c.course_name,
                 s.student_id,
                 s.first_name || ' ' || s.last_name AS student_name,
-                AVG(g.score) AS course_average,
-                RANK() OVER (PARTITION BY c.course_id ORDER BY AVG(g.score) DESC) AS rank
+                sca.avg_score AS course_average,
+                RANK() OVER (PARTITION BY c.course_id ORDER BY sca.avg_score DESC) AS rank
             FROM courses c
             JOIN enrollments e ON c.course_id = e.course_id
             JOIN students s ON e.student_id = s.student_id
-            JOIN assessments a ON c.course_id = a.course_id
-            LEFT JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
-            GROUP BY c.course_id, s.student_id
+            LEFT JOIN StudentCourseAvg sca ON s.student_id = sca.student_id AND c.course_id = sca.course_id
+            WHERE EXISTS (SELECT 1 FROM assessments a WHERE a.course_id = c.course_id)
         )
         SELECT course_code, course_name, student_name, ROUND(course_average, 2) AS average
         FROM CourseAverages
@@ -96,49 +113,82 @@ QUERIES = {
         FROM enrollments e
         JOIN students s ON e.student_id = s.student_id
         JOIN courses c ON e.course_id = c.course_id
-        JOIN assessments a ON c.course_id = a.course_id
-        LEFT JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
+        LEFT JOIN sc_scores g ON s.student_id = g.student_id AND c.course_id = g.course_id
+        WHERE EXISTS (SELECT 1 FROM assessments a WHERE a.course_id = c.course_id)
         GROUP BY e.semester
         ORDER BY e.semester DESC;
     """,
     
     # 6. Attendance Impact on Performance
     "attendance_impact": """
+        WITH StudentCourseAttendance AS (
+            SELECT 
+                student_id,
+                course_id,
+                COUNT(attendance_id) AS total_classes,
+                SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END) AS classes_attended
+            FROM attendance
+            GROUP BY student_id, course_id
+        ),
+        StudentCourseScores AS (
+            SELECT 
+                g.student_id,
+                g.course_id,
+                AVG(g.score) AS average_score
+            FROM sc_scores g
+            GROUP BY g.student_id, g.course_id
+        )
         SELECT 
             s.student_id,
             s.first_name || ' ' || s.last_name AS student_name,
             c.course_name,
-            COUNT(at.attendance_id) AS total_classes,
-            SUM(CASE WHEN at.status = 'Present' THEN 1 ELSE 0 END) AS classes_attended,
-            ROUND(SUM(CASE WHEN at.status = 'Present' THEN 1 ELSE 0 END) * 100.0 / 
-                  NULLIF(COUNT(at.attendance_id), 0), 1) AS attendance_percentage,
-            ROUND(AVG(g.score), 2) AS average_score
+            sca.total_classes,
+            sca.classes_attended,
+            ROUND(sca.classes_attended * 100.0 / 
+                  NULLIF(sca.total_classes, 0), 1) AS attendance_percentage,
+            ROUND(scs.average_score, 2) AS average_score
         FROM students s
         JOIN enrollments e ON s.student_id = e.student_id
         JOIN courses c ON e.course_id = c.course_id
-        LEFT JOIN attendance at ON s.student_id = at.student_id AND c.course_id = at.course_id
-        LEFT JOIN assessments a ON c.course_id = a.course_id
-        LEFT JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
-        GROUP BY s.student_id, c.course_id
-        HAVING COUNT(at.attendance_id) > 0
+        JOIN StudentCourseAttendance sca ON s.student_id = sca.student_id AND c.course_id = sca.course_id
+        LEFT JOIN StudentCourseScores scs ON s.student_id = scs.student_id AND c.course_id = scs.course_id
         ORDER BY attendance_percentage DESC;
     """,
     
     # 7. Department Comparison
     "department_comparison": """
+        WITH StudentCourseScores AS (
+            SELECT 
+                g.student_id,
+                g.course_id,
+                COUNT(g.score) AS score_count,
+                SUM(g.score) AS score_sum,
+                COUNT(CASE WHEN g.score >= 80 THEN 1 END) AS high_scores,
+                COUNT(CASE WHEN g.score < 70 THEN 1 END) AS low_scores
+            FROM sc_scores g
+            GROUP BY g.student_id, g.course_id
+        ),
+        StudentCourseAttendance AS (
+            SELECT 
+                student_id,
+                course_id,
+                COUNT(attendance_id) AS total_classes,
+                SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END) AS classes_attended
+            FROM attendance
+            GROUP BY student_id, course_id
+        )
         SELECT 
             s.department,
             COUNT(DISTINCT s.student_id) AS total_students,
             COUNT(DISTINCT e.course_id) AS total_courses,
-            ROUND(AVG(g.score), 2) AS average_score,
-            COUNT(CASE WHEN g.score >= 80 THEN 1 END) AS high_performers,
-            COUNT(CASE WHEN g.score < 70 THEN 1 END) AS at_risk_count,
-            ROUND(AVG(CASE WHEN at.status = 'Present' THEN 1 ELSE 0 END) * 100, 1) AS avg_attendance
+            ROUND(SUM(scs.score_sum) / SUM(scs.score_count), 2) AS average_score,
+            COALESCE(SUM(scs.high_scores), 0) AS high_performers,
+            COALESCE(SUM(scs.low_scores), 0) AS at_risk_count,
+            COALESCE(ROUND(SUM(sca.classes_attended) * 100.0 / SUM(sca.total_classes), 1), 0.0) AS avg_attendance
         FROM students s
         LEFT JOIN enrollments e ON s.student_id = e.student_id
-        LEFT JOIN assessments a ON e.course_id = a.course_id
-        LEFT JOIN grades g ON s.student_id = g.student_id AND a.assessment_id = g.assessment_id
-        LEFT JOIN attendance at ON s.student_id = at.student_id AND e.course_id = at.course_id
+        LEFT JOIN StudentCourseScores scs ON s.student_id = scs.student_id AND e.course_id = scs.course_id
+        LEFT JOIN StudentCourseAttendance sca ON s.student_id = sca.student_id AND e.course_id = sca.course_id
         GROUP BY s.department
         ORDER BY average_score DESC;
     """,
@@ -212,61 +262,170 @@ QUERIES = {
                 NULLIF(COUNT(g.grade_id), 0) AS pass_rate
         FROM courses c
         LEFT JOIN enrollments e ON c.course_id = e.course_id
-        LEFT JOIN assessments a ON c.course_id = a.course_id
-        LEFT JOIN grades g ON e.student_id = g.student_id AND a.assessment_id = g.assessment_id
-        GROUP BY c.course_id
-        ORDER BY completion_rate DESC;
+        LEFT JOIN sc_scores g ON e.student_id = g.student_id AND c.course_id = g.course_id
+        GROUP BY c.course_id, c.course_code, c.course_name, c.difficulty_level
+        ORDER BY completion_rate DESC, c.course_id;
     """
 }
 
 
+# Grades joined to their assessments once per run; the queries above read
+# from this table instead of repeating the join
+SC_SCORES_QUERY = """
+        SELECT 
+            g.grade_id,
+            g.student_id,
+            a.course_id,
+            a.assessment_type,
+            g.score,
+            g.submission_date
+        FROM grades g
+        JOIN assessments a ON a.assessment_id = g.assessment_id
+"""
+
+SHARED_TABLES = [
+    "DROP TABLE IF EXISTS temp.sc_scores",
+    "CREATE TEMP TABLE sc_scores AS" + SC_SCORES_QUERY,
+    "CREATE INDEX temp.idx_sc_scores_student_course ON sc_scores(student_id, course_id, score)",
+]
+
+
+def create_shared_tables(conn):
+    """Materialize the temp tables the queries read from"""
+    for statement in SHARED_TABLES:
+        conn.execute(statement)
+
+
+# SQLite-only syntax in QUERIES and its DuckDB equivalent, applied in order
+DUCKDB_REWRITES = [
+    ("DATE(g.submission_date)", "g.submission_date"),
+    ("g.submission_date", "CAST(g.submission_date AS DATE)"),
+    ("DATE('now', '-30 days')", "CAST(CURRENT_DATE - INTERVAL 30 DAY AS DATE)"),
+]
+
+
+def to_duckdb(query):
+    """Translate a query from QUERIES to DuckDB's SQL dialect"""
+    for old, new in DUCKDB_REWRITES:
+        query = query.replace(old, new)
+    return query
+
+
+# Connections kept open by run_query, keyed by database path. Each one holds
+# its prepared statements, so repeated calls skip parsing and planning.
+_CONNECTIONS = {}
+
+
+def get_query_connection(db_name):
+    """Return the cached connection for db_name with fresh shared tables"""
+    import sqlite3
+    from database_setup import configure_connection
+    
+    conn, data_version = _CONNECTIONS.get(db_name, (None, None))
+    if conn is None:
+        conn = sqlite3.connect(db_name, cached_statements=256)
+        configure_connection(conn, db_name)
+    
+    # data_version changes whenever another connection commits to the file
+    current_version = conn.execute('PRAGMA data_version').fetchone()[0]
+    if current_version != data_version:
+        create_shared_tables(conn)
+    _CONNECTIONS[db_name] = (conn, current_version)
+    return conn
+
+
+def close_query_connections():
+    """Close every connection opened by run_query"""
+    for conn, _ in _CONNECTIONS.values():
+        conn.close()
+    _CONNECTIONS.clear()
+
+
 def run_query(db_name, query_name):
     """Execute a specific query and return results"""
-    import sqlite3
     import pandas as pd
     
     if query_name not in QUERIES:
         print(f"Query '{query_name}' not found!")
         return None
     
-    conn = sqlite3.connect(db_name)
-    df = pd.read_sql_query(QUERIES[query_name], conn)
-    conn.close()
+    # Identical SQL text on the same connection reuses the prepared statement
+    cursor = get_query_connection(db_name).execute(QUERIES[query_name])
+    columns = [column[0] for column in cursor.description]
+    df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns, coerce_float=True)
     
     return df
 
 
-if __name__ == "__main__":
-    import sqlite3
-    import pandas as pd
-    
-    db_name = 'student_performance.db'
-    
+def print_results(results):
+    """Print the first rows of each query result (or its error)"""
     print("="*80)
     print("SQL QUERY EXAMPLES - STUDENT PERFORMANCE ANALYTICS")
     print("="*80)
     
-    # Run and display each query
-    for query_name, query in QUERIES.items():
+    # Display each query
+    for query_name, df in results.items():
         print(f"\n{'='*80}")
         print(f"Query: {query_name.upper().replace('_', ' ')}")
         print(f"{'='*80}")
         
-        try:
-            conn = sqlite3.connect(db_name)
-            df = pd.read_sql_query(query, conn)
-            conn.close()
-            
-            if len(df) > 0:
-                # Show first 10 rows
-                print(df.head(10).to_string(index=False))
-                if len(df) > 10:
-                    print(f"\n... and {len(df) - 10} more rows")
-            else:
-                print("No results found.")
-        except Exception as e:
-            print(f"Error executing query: {str(e)}")
+        if isinstance(df, Exception):
+            print(f"Error executing query: {str(df)}")
+        elif len(df) > 0:
+            # Show first 10 rows
+            print(df.head(10).to_string(index=False))
+            if len(df) > 10:
+                print(f"\n... and {len(df) - 10} more rows")
+        else:
+            print("No results found.")
     
     print("\n" + "="*80)
     print("All queries executed successfully!")
     print("="*80)
+
+
+def run_all(conn):
+    """Execute and print every query over an open connection"""
+    import pandas as pd
+    
+    create_shared_tables(conn)
+    
+    results = {}
+    for query_name, query in QUERIES.items():
+        try:
+            results[query_name] = pd.read_sql_query(query, conn)
+        except Exception as e:
+            results[query_name] = e
+    
+    print_results(results)
+
+
+def run_all_duckdb(sqlite_path):
+    """Execute every query in DuckDB over the SQLite file and return the results"""
+    import duckdb
+    
+    con = duckdb.connect()
+    try:
+        # DuckDB scans the SQLite tables with its vectorized engine
+        con.execute('INSTALL sqlite; LOAD sqlite;')
+        db_path = str(sqlite_path).replace("'", "''")
+        con.execute(f"ATTACH '{db_path}' AS s (TYPE SQLITE, READ_ONLY)")
+        con.execute('USE s')
+        con.execute("CREATE TEMP TABLE sc_scores AS" + SC_SCORES_QUERY)
+        results = {name: con.execute(to_duckdb(query)).df() for name, query in QUERIES.items()}
+    finally:
+        con.close()
+    
+    return results
+
+
+if __name__ == "__main__":
+    import sqlite3
+    from database_setup import configure_connection
+    
+    db_name = 'student_performance.db'
+    
+    conn = sqlite3.connect(db_name)
+    configure_connection(conn, db_name)
+    run_all(conn)
+    conn.close()